@@ -0,0 +1,194 @@
+from functools import partial
+from jax import Array
+from typing import Callable, Dict, Optional, Tuple
+
+from .configuration_space_controllers import (
+    P_satI_D_plus_steady_state_actuation,
+    P_satI_D_collocated_form_plus_steady_state_actuation,
+    P_satI_D_collocated_form_plus_gravity_cancellation_elastic_compensation,
+)
+from .operational_space_controllers import (
+    basic_operational_space_pid,
+    operational_space_pd_plus_linearized_actuation,
+    operational_space_pd_plus_nonlinear_actuation,
+    operational_space_impedance_control_nonlinear_actuation,
+)
+from .saturation import saturate_control_inputs
+
+# controllers which compute the same control inputs in single precision as in double precision
+# the other controllers lose most of their precision close to the straight configuration (i.e., kappa_b = 0)
+SINGLE_PRECISION_CONTROLLER_TYPES = [
+    "P_satI_D_collocated_form_plus_steady_state_actuation",
+    "P_satI_D_plus_steady_state_actuation",
+    "basic_operational_space_pid",
+]
+# controllers which require the mapping into the collocated form
+COLLOCATED_FORM_CONTROLLER_TYPES = [
+    "P_satI_D_collocated_form_plus_steady_state_actuation",
+    "P_satI_D_collocated_form_plus_gravity_cancellation_elastic_compensation",
+]
+OPERATIONAL_SPACE_CONTROLLER_TYPES = [
+    "operational_space_pd_plus_linearized_actuation",
+    "operational_space_pd_plus_nonlinear_actuation",
+    "operational_space_impedance_control_nonlinear_actuation",
+]
+
+
+def control_step_factory(
+    controller_type: str,
+    params: Dict[str, Array],
+    dynamical_matrices_fn: Callable,
+    dt: float,
+    Kp: Array,
+    Ki: Array,
+    Kd: Array,
+    gamma: Array,
+    map_into_collocated_form_fn: Optional[Callable] = None,
+    operational_space_dynamical_matrices_fn: Optional[Callable] = None,
+) -> Callable:
+    """
+    Create a function that evaluates the controller and saturates the control input within a single XLA computation.
+    Args:
+        controller_type: name of the controller
+        params: dictionary of robot parameters
+        dynamical_matrices_fn: Callable that returns the B, C, G, K, D, and alpha.
+            Needs to conform to the signature: dynamical_matrices_fn(params, q, q_d) -> Tuple[B, C, G, K, D, alpha]
+        dt: time step of the controller [s]
+        Kp: proportional gain matrix of shape (n_phi, n_phi)
+        Ki: integral gain matrix of shape (n_phi, n_phi)
+        Kd: derivative gain matrix of shape (n_phi, n_phi)
+        gamma: horizontal compression factor of the hyperbolic tangent of shape (n_phi, )
+        map_into_collocated_form_fn: Callable that maps the system into the collocated form.
+            Only required for the controllers in COLLOCATED_FORM_CONTROLLER_TYPES.
+            Needs to conform to the signature: map_into_collocated_form_fn(params, q, phi) -> Tuple[varphi, Jh]
+        operational_space_dynamical_matrices_fn: Callable that returns the dynamical matrices in operational space.
+            Only required for the controllers in OPERATIONAL_SPACE_CONTROLLER_TYPES.
+    Returns:
+        control_step_fn: Callable that conforms to the signature
+            control_step_fn(t, chiee, chiee_d, q, q_d, phi, controller_state, pee_des, q_des, phi_ss)
+            -> Tuple[phi_sat, controller_state, controller_info]
+    """
+    # bind the robot parameters once and share the resulting closures among all controllers
+    dynamical_matrices_fn = partial(dynamical_matrices_fn, params)
+    if controller_type in COLLOCATED_FORM_CONTROLLER_TYPES:
+        map_into_collocated_form_fn = partial(map_into_collocated_form_fn, params)
+
+    if controller_type == "P_satI_D_collocated_form_plus_steady_state_actuation":
+        control_fn = partial(
+            P_satI_D_collocated_form_plus_steady_state_actuation,
+            map_into_collocated_form_fn=map_into_collocated_form_fn,
+            dt=dt,
+            Kp=Kp,
+            Ki=Ki,
+            Kd=Kd,
+            gamma=gamma,
+        )
+    elif (
+        controller_type
+        == "P_satI_D_collocated_form_plus_gravity_cancellation_elastic_compensation"
+    ):
+        control_fn = partial(
+            P_satI_D_collocated_form_plus_gravity_cancellation_elastic_compensation,
+            dynamical_matrices_fn=dynamical_matrices_fn,
+            map_into_collocated_form_fn=map_into_collocated_form_fn,
+            dt=dt,
+            Kp=Kp,
+            Ki=Ki,
+            Kd=Kd,
+            gamma=gamma,
+        )
+    elif controller_type == "P_satI_D_plus_steady_state_actuation":
+        control_fn = partial(
+            P_satI_D_plus_steady_state_actuation,
+            dynamical_matrices_fn=dynamical_matrices_fn,
+            dt=dt,
+            Kp=Kp,
+            Ki=Ki,
+            Kd=Kd,
+            gamma=gamma,
+        )
+    elif controller_type == "basic_operational_space_pid":
+        control_fn = partial(
+            basic_operational_space_pid,
+            dt=dt,
+            phi_ss=params["phi_max"].squeeze() / 2,
+            Kp=Kp,
+            Ki=Ki,
+            Kd=Kd,
+        )
+    elif controller_type in OPERATIONAL_SPACE_CONTROLLER_TYPES:
+        if controller_type == "operational_space_pd_plus_linearized_actuation":
+            controller_fn = operational_space_pd_plus_linearized_actuation
+        elif controller_type == "operational_space_pd_plus_nonlinear_actuation":
+            controller_fn = operational_space_pd_plus_nonlinear_actuation
+        else:
+            controller_fn = operational_space_impedance_control_nonlinear_actuation
+        dynamics_eps = 1e-1
+        control_fn = partial(
+            controller_fn,
+            dynamical_matrices_fn=partial(dynamical_matrices_fn, eps=dynamics_eps),
+            operational_space_dynamical_matrices_fn=partial(
+                operational_space_dynamical_matrices_fn,
+                params,
+                eps=dynamics_eps,
+            ),
+            Kp=Kp,
+            Kd=Kd,
+            eps=dynamics_eps,
+        )
+    else:
+        raise NotImplementedError(
+            "Controller type {} not implemented".format(controller_type)
+        )
+
+    def control_step_fn(
+        t: float,
+        chiee: Array,
+        chiee_d: Array,
+        q: Array,
+        q_d: Array,
+        phi: Array,
+        controller_state: Dict[str, Array],
+        pee_des: Array,
+        q_des: Array,
+        phi_ss: Array,
+    ) -> Tuple[Array, Dict[str, Array], Dict[str, Array]]:
+        if controller_type == "basic_operational_space_pid":
+            phi_des, controller_state, controller_info = control_fn(
+                t,
+                chiee,
+                chiee_d,
+                phi,
+                controller_state=controller_state,
+                pee_des=pee_des,
+            )
+        elif controller_type in OPERATIONAL_SPACE_CONTROLLER_TYPES:
+            phi_des, controller_info = control_fn(
+                t, chiee, chiee_d, q, q_d, phi, pee_des=pee_des
+            )
+        else:
+            phi_des, controller_state, controller_info = control_fn(
+                t,
+                q,
+                q_d,
+                phi,
+                controller_state=controller_state,
+                pee_des=pee_des,
+                q_des=q_des,
+                phi_ss=phi_ss,
+            )
+
+        # compensate for the handedness specified in the parameters
+        phi_des_unsat = params["h"].flatten() * phi_des
+
+        # saturate the control input
+        phi_sat, controller_state, controller_info = saturate_control_inputs(
+            params,
+            phi_des_unsat,
+            controller_state=controller_state,
+            controller_info=controller_info,
+        )
+
+        return phi_sat, controller_state, controller_info
+
+    return control_step_fn
@@ -1,12 +1,15 @@
 from jax import Array, debug, jit
 import jax.numpy as jnp
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 
 @jit
 def saturate_control_inputs(
     params: Dict[str, Array],
+    phi_des: Array,
     *args,
+    controller_state: Optional[Dict[str, Array]] = None,
+    controller_info: Optional[Dict[str, Array]] = None,
 ):
     """
     Saturate the control inputs (compensated with handedness) to the range [0, phi_max].
@@ -17,33 +20,44 @@ def saturate_control_inputs(
         The parameters of the system.
     phi_des: Array
         The desired control inputs of shape (n_phi, ).
-    controller_state: Dict[str, Array]
-        The state of the controller.
+    controller_state: Optional[Dict[str, Array]]
+        The state of the controller. Can be passed either positionally (before controller_info) or as keyword argument.
     controller_info: Dict[str, Array]
-        Information about intermediate computations.
+        Information about intermediate computations. Required, but can be passed either positionally or as keyword
+        argument. Accordingly, the function can be called as
+        saturate_control_inputs(params, phi_des, controller_info),
+        saturate_control_inputs(params, phi_des, controller_state, controller_info), or
+        saturate_control_inputs(params, phi_des, controller_state=..., controller_info=...).
     Returns
     -------
     phi_sat: Array
         The saturated control inputs.
     controller_state: Dict[str, Array]
-        The updated state of the controller.
+        The updated state of the controller. Only returned if controller_state was given.
     controller_info: Dict[str, Array]
         Information about intermediate computations.
     """
     phi_max = params["phi_max"]
     h = params["h"]
 
-    if len(args) == 2:
-        phi_des, controller_info = args
-    else:
-        phi_des, controller_state, controller_info = args
+    if len(args) == 1:
+        controller_info = args[0]
+    elif len(args) == 2:
+        controller_state, controller_info = args
+    elif len(args) > 2:
+        raise ValueError(
+            "Expected at most two positional arguments (controller_state, controller_info) after phi_des, "
+            f"but got {len(args)}."
+        )
+    if controller_info is None:
+        raise ValueError("The controller_info needs to be provided.")
 
     phi_sat = jnp.clip(h.flatten() * phi_des, 0.0, phi_max.flatten())
 
     controller_info["phi_des_unsat"] = phi_des
     controller_info["phi_des_sat"] = phi_sat
 
-    if len(args) == 2:
+    if controller_state is None:
         return phi_sat, controller_info
     else:
         return phi_sat, controller_state, controller_info
@@ -1,4 +1,4 @@
-from functools import partial
+from functools import lru_cache, partial
 from jax import Array, debug, jacfwd, jit
 import jax.numpy as jnp
 import jaxopt as jo
@@ -46,6 +46,27 @@ def static_inversion_factory(
     return residual_fn
 
 
+@lru_cache(maxsize=None)
+def scipy_rootfinding_solver_factory(
+    residual_fn: Callable, maxiter: int = 1000
+) -> jo.ScipyRootFinding:
+    """
+    Create the scipy root finding solver for static inversion.
+    The solver is cached, so that its jitted residual and Jacobian are only traced once for a given residual function
+    and reused for all subsequent setpoints.
+    Args:
+        residual_fn: Callable that returns the residual vector given the end-effector orientation and the motor positions.
+            Needs to conform to the signature: residual_fn(x, pee_des) -> residual
+        maxiter: Maximum number of iterations for the optimization algorithm.
+    Returns:
+        solver: scipy root finding solver, which receives pee_des as a keyword argument to `run`.
+    """
+    solver = jo.ScipyRootFinding(
+        optimality_fun=residual_fn, method="lm", options={"maxiter": maxiter}, jit=True
+    )
+    return solver
+
+
 def statically_invert_actuation_to_task_space_scipy_rootfinding(
     params: Dict[str, Array],
     residual_fn: Callable,
@@ -81,15 +102,11 @@ def statically_invert_actuation_to_task_space_scipy_rootfinding(
     # initial guess for [theta, phi1, ..., phin]
     x0 = jnp.concatenate([q0[2:3], phi0], axis=0)
 
-    # partial off pee_des from residual_fn
-    residual_fn = partial(residual_fn, pee_des=pee_des)
-
     # solve the optimization problem
-    solver = jo.ScipyRootFinding(
-        optimality_fun=residual_fn, method="lm", options={"maxiter": maxiter}, jit=True
-    )
-    x_best, info = solver.run(x0)
-    optimality_error = solver.l2_optimality_error(x_best)
+    # pee_des is passed as an argument so that the residual function is not traced again for each setpoint
+    solver = scipy_rootfinding_solver_factory(residual_fn, maxiter=maxiter)
+    x_best, info = solver.run(x0, pee_des=pee_des)
+    optimality_error = solver.l2_optimality_error(x_best, pee_des=pee_des)
     if verbose:
         debug.print(
             "ScipyRootFinding finished with x_best = {x_best}, optimality_error = {optimality_error} and info:\n{info}",
@@ -118,6 +135,7 @@ def statically_invert_actuation_to_task_space_projected_descent(
     q0: Array,
     phi0: Array,
     maxiter: int = 2500,
+    tol: float = 1e-5,
     verbose: bool = True,
 ) -> Tuple[Array, Array, Array, Array]:
     """
@@ -132,6 +150,7 @@ def statically_invert_actuation_to_task_space_projected_descent(
         q0: Initial configuration vector of shape (n_q, )
         phi0: Initial actuation of shape (n_phi, )
         maxiter: Maximum number of iterations for the optimization algorithm.
+        tol: Tolerance on the optimality error. The optimization stops early once the tolerance is reached.
         verbose: If True, print the optimization result.
     Returns:
         chiee_des: Desired end-effector pose vector of shape (3, )
@@ -185,7 +204,7 @@ def statically_invert_actuation_to_task_space_projected_descent(
         maxiter=maxiter,
         projection=jo.projection.projection_box,
         decrease_factor=0.8,
-        tol=1e-5,
+        tol=tol,
     )
     x_best, info = solver.run(x0, hyperparams_proj=(lb, ub))
     optimality_error = solver.l2_optimality_error(x_best, hyperparams_proj=(lb, ub))
@@ -10,6 +10,7 @@ from jax import numpy as jnp
 import jsrm
 from jsrm.parameters.hsa_params import PARAMS_FPU_CONTROL, PARAMS_EPU_CONTROL
 from jsrm.systems import planar_hsa
+import numpy as onp
 import rclpy
 from rclpy.node import Node
 from rclpy.time import Time
@@ -88,39 +89,46 @@ class CalibrationNode(Node):
         )
 
         # initialize state
-        self.q = jnp.zeros_like(self.xi_eq_ik)  # generalized coordinates
+        self.q = onp.zeros(self.xi_eq_ik.shape)  # generalized coordinates
         self.n_q = self.q.shape[0]  # number of generalized coordinates
         self.n_phi = self.known_params["roff"].flatten().shape[0]  # number of actuators
 
         # history of configurations
         # the longer the history, the more delays we introduce, but the less noise we get
+        # the history is stored in a ring buffer. self.hs_head points to the oldest entry
         self.declare_parameter("lhs", 20)
-        self.t_hs = jnp.zeros((self.get_parameter("lhs").value,))
-        self.q_hs = jnp.zeros((self.get_parameter("lhs").value, self.n_q))
+        self.t_hs = onp.zeros((self.get_parameter("lhs").value,))
+        self.q_hs = onp.zeros((self.get_parameter("lhs").value, self.n_q))
+        self.hs_head = 0
+        self.num_hs_entries = 0  # number of valid entries in the history
 
         self.timer = self.create_timer(0.1, self.timer_callback)
 
     def configuration_listener_callback(self, msg):
         t = Time.from_msg(msg.header.stamp).nanoseconds / 1e9
-        self.q = jnp.array([msg.kappa_b, msg.sigma_sh, msg.sigma_a])
+        self.q = onp.array([msg.kappa_b, msg.sigma_sh, msg.sigma_a])
 
-        # update history
-        self.t_hs = jnp.roll(self.t_hs, shift=-1, axis=0)
-        self.t_hs = self.t_hs.at[-1].set(t)
-        self.q_hs = jnp.roll(self.q_hs, shift=-1, axis=0)
-        self.q_hs = self.q_hs.at[-1].set(self.q)
+        # update history by overwriting the oldest entry
+        self.t_hs[self.hs_head] = t
+        self.q_hs[self.hs_head] = self.q
+        self.hs_head = (self.hs_head + 1) % self.t_hs.shape[0]
+        self.num_hs_entries = min(self.num_hs_entries + 1, self.t_hs.shape[0])
 
     def timer_callback(self):
-        if jnp.any(self.t_hs == 0.0):
+        if self.num_hs_entries < self.t_hs.shape[0]:
             # buffer is not full yet
             return
 
+        # order the history chronologically
+        t_hs = onp.concatenate((self.t_hs[self.hs_head :], self.t_hs[: self.hs_head]))
+        q_hs = onp.concatenate((self.q_hs[self.hs_head :], self.q_hs[: self.hs_head]))
+
         data_hs = {
-            "t_ts": self.t_hs,
-            "xi_ts": self.xi_eq_ik + self.q_hs,
-            "xi_d_ts": jnp.zeros_like(self.q_hs),
-            "xi_dd_ts": jnp.zeros_like(self.q_hs),
-            "phi_ts": jnp.zeros((self.t_hs.shape[0], self.n_phi)),
+            "t_ts": jnp.asarray(t_hs),
+            "xi_ts": self.xi_eq_ik + jnp.asarray(q_hs),
+            "xi_d_ts": jnp.zeros(q_hs.shape),
+            "xi_dd_ts": jnp.zeros(q_hs.shape),
+            "phi_ts": jnp.zeros((t_hs.shape[0], self.n_phi)),
         }
 
         Pi_est = optimize_with_closed_form_linear_lq(
@@ -1,21 +1,32 @@
 from example_interfaces.msg import Float64MultiArray
-from functools import partial
+import os
 from jax import config as jax_config
 
-jax_config.update("jax_enable_x64", True)  # double precision
+# double precision (lowered to single precision in the node for some controllers)
+jax_config.update("jax_enable_x64", True)
 jax_config.update("jax_platform_name", "cpu")  # use CPU
+# persistently cache the compiled executables to speed up subsequent launches of the node
+jax_config.update(
+    "jax_compilation_cache_dir",
+    os.path.join(os.path.expanduser("~"), ".cache", "hsa_planar_control"),
+)
+jax_config.update("jax_persistent_cache_min_compile_time_secs", 0.1)
 import jax
-from jax import Array, jit
+from jax import jit
 from jax import numpy as jnp
 import jsrm
 from jsrm.parameters.hsa_params import PARAMS_FPU_CONTROL, PARAMS_EPU_CONTROL
 from jsrm.systems import planar_hsa
+import numpy as onp
 import rclpy
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
+from rclpy.executors import MultiThreadedExecutor
 from rclpy.node import Node
+from rclpy.qos import HistoryPolicy, QoSProfile, ReliabilityPolicy
 from rclpy.time import Time
 from pathlib import Path
+from threading import Lock
 
-from geometry_msgs.msg import Pose2D
 from hsa_control_interfaces.msg import (
     PlanarSetpoint,
     PlanarSetpointControllerInfo,
@@ -24,36 +35,42 @@ from hsa_control_interfaces.msg import (
 from mocap_optitrack_interfaces.msg import PlanarCsConfiguration
 
 from hsa_planar_control.collocated_form import mapping_into_collocated_form_factory
-from hsa_planar_control.controllers.configuration_space_controllers import (
-    P_satI_D_plus_steady_state_actuation,
-    P_satI_D_collocated_form_plus_steady_state_actuation,
-    P_satI_D_collocated_form_plus_gravity_cancellation_elastic_compensation,
-)
-from hsa_planar_control.controllers.operational_space_controllers import (
-    basic_operational_space_pid,
-    operational_space_pd_plus_linearized_actuation,
-    operational_space_pd_plus_nonlinear_actuation,
-    operational_space_impedance_control_nonlinear_actuation,
+from hsa_planar_control.controllers.control_step import (
+    COLLOCATED_FORM_CONTROLLER_TYPES,
+    SINGLE_PRECISION_CONTROLLER_TYPES,
+    control_step_factory,
 )
-from hsa_planar_control.controllers.saturation import saturate_control_inputs
 
 
 class ModelBasedControlNode(Node):
     def __init__(self):
         super().__init__("model_based_control_node")
+        # separate callback groups so that the measurements can be received while the controller is evaluated
+        self.measurement_cb_group = MutuallyExclusiveCallbackGroup()
+        self.setpoint_cb_group = MutuallyExclusiveCallbackGroup()
+        self.control_cb_group = MutuallyExclusiveCallbackGroup()
+        # only the latest measurement is relevant for the controller, so we drop outdated ones
+        measurement_qos = QoSProfile(
+            depth=1,
+            reliability=ReliabilityPolicy.BEST_EFFORT,
+            history=HistoryPolicy.KEEP_LAST,
+        )
+
         self.declare_parameter("configuration_topic", "configuration")
         self.configuration_sub = self.create_subscription(
             PlanarCsConfiguration,
             self.get_parameter("configuration_topic").value,
             self.configuration_listener_callback,
-            10,
+            measurement_qos,
+            callback_group=self.measurement_cb_group,
         )
         self.declare_parameter("configuration_velocity_topic", "configuration_velocity")
         self.configuration_velocity_sub = self.create_subscription(
             PlanarCsConfiguration,
             self.get_parameter("configuration_velocity_topic").value,
             self.configuration_velocity_listener_callback,
-            10,
+            measurement_qos,
+            callback_group=self.measurement_cb_group,
         )
 
         self.declare_parameter("end_effector_pose_topic", "end_effector_pose")
@@ -61,15 +78,30 @@ class ModelBasedControlNode(Node):
             Pose2DStamped,
             self.get_parameter("end_effector_pose_topic").value,
             self.end_effector_pose_listener_callback,
-            10,
+            measurement_qos,
+            callback_group=self.measurement_cb_group,
         )
         self.declare_parameter("end_effector_velocity_topic", "end_effector_velocity")
         self.end_effector_velocity_sub = self.create_subscription(
             Pose2DStamped,
             self.get_parameter("end_effector_velocity_topic").value,
             self.end_effector_velocity_listener_callback,
-            10,
+            measurement_qos,
+            callback_group=self.measurement_cb_group,
+        )
+
+        self.declare_parameter(
+            "controller_type", "P_satI_D_collocated_form_plus_steady_state_actuation"
         )
+        self.controller_type = self.get_parameter("controller_type").value
+        # precision of the controller: the controllers that are as accurate in single precision as in double precision
+        # are evaluated in single precision, which is faster. As jax promotes mixed inputs to the enabled precision,
+        # this also disables double precision for jax. The robot parameters are cast to this precision below.
+        if self.controller_type in SINGLE_PRECISION_CONTROLLER_TYPES:
+            self.dtype = onp.float32
+        else:
+            self.dtype = onp.float64
+        jax_config.update("jax_enable_x64", self.dtype == onp.float64)
 
         # filepath to symbolic expressions
         sym_exp_filepath = (
@@ -94,6 +126,11 @@ class ModelBasedControlNode(Node):
             self.params = PARAMS_EPU_CONTROL.copy()
         else:
             raise ValueError(f"Unknown HSA material: {hsa_material}")
+        # cast the parameters to the precision of the controller
+        self.params = jax.tree_util.tree_map(
+            lambda x: x.astype(self.dtype) if hasattr(x, "astype") else x,
+            self.params,
+        )
 
         # parameters for specifying different rest strains
         self.declare_parameter("kappa_b_eq", self.params["kappa_b_eq"].mean().item())
@@ -132,15 +169,19 @@ class ModelBasedControlNode(Node):
         )
 
         # initialize system measurements
-        self.q = jnp.zeros_like(self.xi_eq)  # generalized coordinates
+        # the measurements and setpoints are kept as numpy arrays and only handed over to jax when calling the controller
+        # generalized coordinates
+        self.q = onp.zeros(self.xi_eq.shape, dtype=self.dtype)
         self.n_q = self.q.shape[0]  # number of generalized coordinates
-        self.q_d = jnp.zeros_like(self.q)  # velocity of generalized coordinates
+        self.q_d = onp.zeros_like(self.q)  # velocity of generalized coordinates
         # end-effector pose
-        self.chiee = forward_kinematics_end_effector_fn(self.params, self.q)
-        self.chiee_d = jnp.zeros_like(self.chiee)  # velocity of end-effector pose
+        self.chiee = onp.asarray(
+            forward_kinematics_end_effector_fn(self.params, self.q), dtype=self.dtype
+        )
+        self.chiee_d = onp.zeros_like(self.chiee)  # velocity of end-effector pose
 
         # present actuation coordinates
-        self.phi = jnp.zeros_like(self.params["roff"].flatten())
+        self.phi = onp.zeros(self.params["roff"].flatten().shape, dtype=self.dtype)
         self.declare_parameter(
             "present_planar_actuation_topic", "present_planar_actuation"
         )
@@ -149,33 +190,38 @@ class ModelBasedControlNode(Node):
             self.get_parameter("present_planar_actuation_topic").value,
             self.actuation_coordinates_listener_callback,
             10,
+            callback_group=self.measurement_cb_group,
         )
         # publisher of control input
         self.declare_parameter("control_input_topic", "control_input")
         self.control_input_pub = self.create_publisher(
             Float64MultiArray, self.get_parameter("control_input_topic").value, 10
         )
+        # the message is reused for every control input
+        self.control_input_msg = Float64MultiArray()
 
         self.declare_parameter("setpoint_topic", "setpoint")
         self.setpoints_sub = self.create_subscription(
             PlanarSetpoint,
             self.get_parameter("setpoint_topic").value,
             self.setpoint_listener_callback,
-            10,
+            QoSProfile(
+                depth=1,
+                reliability=ReliabilityPolicy.RELIABLE,
+                history=HistoryPolicy.KEEP_LAST,
+            ),
+            callback_group=self.setpoint_cb_group,
         )
-        self.q_des = jnp.zeros_like(self.q)
-        self.chiee_des = jnp.zeros((3,))
-        self.phi_ss = jnp.zeros_like(self.phi)
+        self.q_des = onp.zeros_like(self.q)
+        self.chiee_des = onp.zeros((3,), dtype=self.dtype)
+        self.pee_des = self.chiee_des[:2]
+        self.phi_ss = onp.zeros_like(self.phi)
         self.setpoint_msg = None
         self.declare_parameter("reset_integral_error_on_setpoint_change", False)
         self.reset_integral_error = self.get_parameter(
             "reset_integral_error_on_setpoint_change"
         ).value
 
-        self.declare_parameter(
-            "controller_type", "P_satI_D_collocated_form_plus_steady_state_actuation"
-        )
-        self.controller_type = self.get_parameter("controller_type").value
         # it seems that roughly 45 Hz is the maximum at the moment
         self.declare_parameter("control_frequency", 100.0)
         self.control_frequency = self.get_parameter("control_frequency").value
@@ -191,185 +237,109 @@ class ModelBasedControlNode(Node):
         self.controller_state = {
             "integral_error": jnp.zeros_like(self.phi),
         }
-        map_into_collocated_form_fn, _ = mapping_into_collocated_form_factory(
-            sym_exp_filepath, sys_helpers
-        )
-
-        if (
-            self.controller_type
-            == "P_satI_D_collocated_form_plus_steady_state_actuation"
-        ):
-            self.control_fn = jit(
-                partial(
-                    P_satI_D_collocated_form_plus_steady_state_actuation,
-                    map_into_collocated_form_fn=partial(
-                        map_into_collocated_form_fn, self.params
-                    ),
-                    dt=control_dt,
-                    Kp=Kp,
-                    Ki=Ki,
-                    Kd=Kd,
-                    gamma=gamma,
-                )
-            )
-        elif (
-            self.controller_type
-            == "P_satI_D_collocated_form_plus_gravity_cancellation_elastic_compensation"
-        ):
-            self.control_fn = jit(
-                partial(
-                    P_satI_D_collocated_form_plus_gravity_cancellation_elastic_compensation,
-                    dynamical_matrices_fn=partial(dynamical_matrices_fn, self.params),
-                    map_into_collocated_form_fn=partial(
-                        map_into_collocated_form_fn, self.params
-                    ),
-                    dt=control_dt,
-                    Kp=Kp,
-                    Ki=Ki,
-                    Kd=Kd,
-                    gamma=gamma,
-                )
-            )
-        elif self.controller_type == "P_satI_D_plus_steady_state_actuation":
-            self.control_fn = jit(
-                partial(
-                    P_satI_D_plus_steady_state_actuation,
-                    dynamical_matrices_fn=partial(dynamical_matrices_fn, self.params),
-                    dt=control_dt,
-                    Kp=Kp,
-                    Ki=Ki,
-                    Kd=Kd,
-                    gamma=gamma,
-                )
-            )
-        elif self.controller_type == "basic_operational_space_pid":
-            self.control_fn = jit(
-                partial(
-                    basic_operational_space_pid,
-                    dt=control_dt,
-                    phi_ss=self.params["phi_max"].squeeze() / 2,
-                    Kp=Kp,
-                    Ki=Ki,
-                    Kd=Kd,
-                )
-            )
-        elif self.controller_type in [
-            "operational_space_pd_plus_linearized_actuation",
-            "operational_space_pd_plus_nonlinear_actuation",
-            "operational_space_impedance_control_nonlinear_actuation",
-        ]:
-            if self.controller_type == "operational_space_pd_plus_linearized_actuation":
-                control_fn = operational_space_pd_plus_linearized_actuation
-            elif (
-                self.controller_type == "operational_space_pd_plus_nonlinear_actuation"
-            ):
-                control_fn = operational_space_pd_plus_nonlinear_actuation
-            else:
-                control_fn = operational_space_impedance_control_nonlinear_actuation
-            dynamics_eps = 1e-1
-            self.control_fn = jit(
-                partial(
-                    control_fn,
-                    dynamical_matrices_fn=partial(
-                        dynamical_matrices_fn, self.params, eps=dynamics_eps
-                    ),
-                    operational_space_dynamical_matrices_fn=partial(
-                        sys_helpers["operational_space_dynamical_matrices_fn"],
-                        self.params,
-                        eps=dynamics_eps,
-                    ),
-                    Kp=Kp,
-                    Kd=Kd,
-                    eps=dynamics_eps,
-                )
+        # protects the setpoint and the controller state, which are accessed from different callback groups
+        self.controller_lock = Lock()
+        if self.controller_type in COLLOCATED_FORM_CONTROLLER_TYPES:
+            # loading and lambdifying the symbolic expressions of the collocated form is expensive,
+            # so we only do it for the controllers that actually need it
+            map_into_collocated_form_fn, _ = mapping_into_collocated_form_factory(
+                sym_exp_filepath, sys_helpers
             )
         else:
-            raise NotImplementedError(
-                "Controller type {} not implemented".format(self.controller_type)
-            )
+            map_into_collocated_form_fn = None
+        control_step_fn = control_step_factory(
+            self.controller_type,
+            self.params,
+            dynamical_matrices_fn,
+            dt=control_dt,
+            Kp=Kp,
+            Ki=Ki,
+            Kd=Kd,
+            gamma=gamma,
+            map_into_collocated_form_fn=map_into_collocated_form_fn,
+            operational_space_dynamical_matrices_fn=sys_helpers[
+                "operational_space_dynamical_matrices_fn"
+            ],
+        )
 
-        if self.controller_type == "basic_operational_space_pid":
-            phi_des_dummy, _, _ = self.control_fn(
-                0.0,
-                self.chiee,
-                self.chiee_d,
-                self.phi,
-                controller_state=self.controller_state,
-                pee_des=self.chiee_des[:2],
-            )
-        elif self.controller_type in [
-            "operational_space_pd_plus_linearized_actuation",
-            "operational_space_pd_plus_nonlinear_actuation",
-            "operational_space_impedance_control_nonlinear_actuation",
-        ]:
-            phi_des_dummy, _ = self.control_fn(
-                0.0,
-                self.chiee,
-                self.chiee_d,
-                self.q,
-                self.q_d,
-                self.phi,
-                pee_des=self.chiee_des[:2],
-            )
-        else:
-            phi_des_dummy, _, _ = self.control_fn(
-                0.0,
-                self.q,
-                self.q_d,
-                self.phi,
-                controller_state=self.controller_state,
-                pee_des=self.chiee_des[:2],
-                q_des=self.q_des,
-                phi_ss=self.phi_ss,
-            )
-        self.get_logger().info(f"Finished jitting the controller function.")
+        # example inputs for ahead-of-time compilation of the controller
+        control_args = (
+            0.0,
+            self.chiee,
+            self.chiee_d,
+            self.q,
+            self.q_d,
+            self.phi,
+            self.controller_state,
+            self.pee_des,
+            self.q_des,
+            self.phi_ss,
+        )
+
+        # compile the controller ahead-of-time
+        # the buffers of the controller state are donated, as the state is replaced after each step
+        self.control_fn = (
+            jit(control_step_fn, donate_argnums=(6,)).lower(*control_args).compile()
+        )
+        self.get_logger().info("Finished compiling the controller function.")
 
         # initialize publisher for controller info
         self.controller_info_pub = self.create_publisher(
             PlanarSetpointControllerInfo, "controller_info", 10
         )
+        self.controller_info_msg = PlanarSetpointControllerInfo()
 
         self.control_timer = self.create_timer(
-            1.0 / self.control_frequency, self.call_controller
+            1.0 / self.control_frequency,
+            self.call_controller,
+            callback_group=self.control_cb_group,
         )
 
         self.start_time = self.get_clock().now()
 
     def configuration_listener_callback(self, msg: PlanarCsConfiguration):
         # set the current configuration
-        self.q = jnp.array([msg.kappa_b, msg.sigma_sh, msg.sigma_a])
+        self.q = onp.array([msg.kappa_b, msg.sigma_sh, msg.sigma_a], dtype=self.dtype)
 
     def configuration_velocity_listener_callback(self, msg: PlanarCsConfiguration):
         # set the current configuration velocity
-        self.q_d = jnp.array([msg.kappa_b, msg.sigma_sh, msg.sigma_a])
+        self.q_d = onp.array([msg.kappa_b, msg.sigma_sh, msg.sigma_a], dtype=self.dtype)
 
     def end_effector_pose_listener_callback(self, msg: Pose2DStamped):
         # set the current end-effector pose
-        self.chiee = jnp.array([msg.pose.x, msg.pose.y, msg.pose.theta])
+        self.chiee = onp.array(
+            [msg.pose.x, msg.pose.y, msg.pose.theta], dtype=self.dtype
+        )
 
     def end_effector_velocity_listener_callback(self, msg: Pose2DStamped):
         # set the current end-effector velocity
-        self.chiee_d = jnp.array([msg.pose.x, msg.pose.y, msg.pose.theta])
+        self.chiee_d = onp.array(
+            [msg.pose.x, msg.pose.y, msg.pose.theta], dtype=self.dtype
+        )
 
     def actuation_coordinates_listener_callback(self, msg: Float64MultiArray):
         # present actuation coordinates
-        self.phi = jnp.array(msg.data)
+        self.phi = onp.array(msg.data, dtype=self.dtype)
 
     def setpoint_listener_callback(self, msg: PlanarSetpoint):
-        self.setpoint_msg = msg
-        self.q_des = jnp.array(
-            [msg.q_des.kappa_b, msg.q_des.sigma_sh, msg.q_des.sigma_a]
-        )
-        self.chiee_des = jnp.array(
-            [msg.chiee_des.x, msg.chiee_des.y, msg.chiee_des.theta]
-        )
-        self.phi_ss = jnp.array(msg.phi_ss)
-
-        if self.reset_integral_error:
-            # reset integral error
-            self.controller_state["integral_error"] = jnp.zeros_like(
-                self.controller_state["integral_error"]
+        with self.controller_lock:
+            self.setpoint_msg = msg
+            self.q_des = onp.array(
+                [msg.q_des.kappa_b, msg.q_des.sigma_sh, msg.q_des.sigma_a],
+                dtype=self.dtype,
+            )
+            self.chiee_des = onp.array(
+                [msg.chiee_des.x, msg.chiee_des.y, msg.chiee_des.theta],
+                dtype=self.dtype,
             )
+            self.pee_des = self.chiee_des[:2]
+            self.phi_ss = onp.array(msg.phi_ss, dtype=self.dtype)
+
+            if self.reset_integral_error:
+                # reset integral error
+                self.controller_state["integral_error"] = jnp.zeros_like(
+                    self.controller_state["integral_error"]
+                )
 
     def call_controller(self):
         t = (self.get_clock().now() - self.start_time).nanoseconds / 1e9
@@ -382,91 +352,55 @@ class ModelBasedControlNode(Node):
         q, q_d = self.q, self.q_d
         chiee, chiee_d = self.chiee, self.chiee_d
 
-        # evaluate controller
-        if self.controller_type == "basic_operational_space_pid":
-            phi_des, self.controller_state, controller_info = self.control_fn(
-                t,
-                chiee,
-                chiee_d,
-                self.phi,
-                controller_state=self.controller_state,
-                pee_des=self.chiee_des[:2],
-            )
-        elif self.controller_type in [
-            "operational_space_pd_plus_linearized_actuation",
-            "operational_space_pd_plus_nonlinear_actuation",
-            "operational_space_impedance_control_nonlinear_actuation",
-        ]:
-            phi_des, controller_info = self.control_fn(
+        with self.controller_lock:
+            # evaluate the controller and saturate the control input
+            # the numpy arrays are directly passed to the compiled controller, which transfers them to the device
+            phi_sat, self.controller_state, controller_info = self.control_fn(
                 t,
                 chiee,
                 chiee_d,
                 q,
                 q_d,
                 self.phi,
-                pee_des=self.chiee_des[:2],
-            )
-        else:
-            phi_des, self.controller_state, controller_info = self.control_fn(
-                t,
-                q,
-                q_d,
-                self.phi,
-                controller_state=self.controller_state,
-                pee_des=self.chiee_des[:2],
-                q_des=self.q_des,
-                phi_ss=self.phi_ss,
+                self.controller_state,
+                self.pee_des,
+                self.q_des,
+                self.phi_ss,
             )
 
-        # compensate for the handedness specified in the parameters
-        phi_des_unsat = self.params["h"].flatten() * phi_des
-
-        # saturate the control input
-        phi_sat, self.controller_state, controller_info = saturate_control_inputs(
-            self.params,
-            phi_des_unsat,
-            controller_state=self.controller_state,
-            controller_info=controller_info,
-        )
-
-        # self.get_logger().info(f"Saturated control inputs: {phi_sat}")
+        # wait for the controller and transfer all of its outputs to the host at once
+        phi_sat, controller_info = jax.device_get((phi_sat, controller_info))
+        phi_sat = phi_sat.tolist()
+        phi_des_unsat = controller_info["phi_des_unsat"].tolist()
 
         # publish message with the control input
-        phi_msg = Float64MultiArray(data=phi_sat.tolist())
-        self.control_input_pub.publish(phi_msg)
+        self.control_input_msg.data = phi_sat
+        self.control_input_pub.publish(self.control_input_msg)
 
         # publish controller info
-        controller_info_msg = PlanarSetpointControllerInfo()
-        controller_info_msg.header.stamp = self.get_clock().now().to_msg()
+        # the message is reused, so we only overwrite its scalar fields
+        controller_info_msg = self.controller_info_msg
+        stamp = self.get_clock().now().to_msg()
+        controller_info_msg.header.stamp = stamp
         controller_info_msg.planar_setpoint = self.setpoint_msg
-        controller_info_msg.q = PlanarCsConfiguration(
-            header=controller_info_msg.header,
-            kappa_b=q[0].item(),
-            sigma_sh=q[1].item(),
-            sigma_a=q[2].item(),
-        )
-        controller_info_msg.q_d = PlanarCsConfiguration(
-            header=controller_info_msg.header,
-            kappa_b=q_d[0].item(),
-            sigma_sh=q_d[1].item(),
-            sigma_a=q_d[2].item(),
-        )
-        controller_info_msg.chiee = Pose2DStamped(
-            header=controller_info_msg.header,
-            pose=Pose2D(
-                x=self.chiee[0].item(),
-                y=self.chiee[1].item(),
-                theta=self.chiee[2].item(),
-            ),
-        )
-        controller_info_msg.chiee_d = Pose2DStamped(
-            header=controller_info_msg.header,
-            pose=Pose2D(
-                x=self.chiee_d[0].item(),
-                y=self.chiee_d[1].item(),
-                theta=self.chiee_d[2].item(),
-            ),
-        )
+        q, q_d = q.tolist(), q_d.tolist()
+        chiee, chiee_d = chiee.tolist(), chiee_d.tolist()
+        controller_info_msg.q.header.stamp = stamp
+        controller_info_msg.q.kappa_b = q[0]
+        controller_info_msg.q.sigma_sh = q[1]
+        controller_info_msg.q.sigma_a = q[2]
+        controller_info_msg.q_d.header.stamp = stamp
+        controller_info_msg.q_d.kappa_b = q_d[0]
+        controller_info_msg.q_d.sigma_sh = q_d[1]
+        controller_info_msg.q_d.sigma_a = q_d[2]
+        controller_info_msg.chiee.header.stamp = stamp
+        controller_info_msg.chiee.pose.x = chiee[0]
+        controller_info_msg.chiee.pose.y = chiee[1]
+        controller_info_msg.chiee.pose.theta = chiee[2]
+        controller_info_msg.chiee_d.header.stamp = stamp
+        controller_info_msg.chiee_d.pose.x = chiee_d[0]
+        controller_info_msg.chiee_d.pose.y = chiee_d[1]
+        controller_info_msg.chiee_d.pose.theta = chiee_d[2]
         if "e_int" in controller_info:
             controller_info_msg.e_int = controller_info["e_int"].tolist()
         if "f" in controller_info:
@@ -481,8 +415,8 @@ class ModelBasedControlNode(Node):
             controller_info_msg.actuation_optimality_error = controller_info[
                 "actuation_optimality_error"
             ].item()
-        controller_info_msg.phi_des_unsat = phi_des_unsat.tolist()
-        controller_info_msg.phi_des_sat = phi_sat.tolist()
+        controller_info_msg.phi_des_unsat = phi_des_unsat
+        controller_info_msg.phi_des_sat = phi_sat
         self.controller_info_pub.publish(controller_info_msg)
 
 
@@ -492,7 +426,10 @@ def main(args=None):
 
     node = ModelBasedControlNode()
 
-    rclpy.spin(node)
+    # evaluate the controller in parallel to receiving measurements and setpoints
+    executor = MultiThreadedExecutor(num_threads=3)
+    executor.add_node(node)
+    executor.spin()
 
     # Destroy the node explicitly
     # (optional - otherwise it will be done automatically
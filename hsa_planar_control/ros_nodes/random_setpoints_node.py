@@ -11,6 +11,7 @@ from jax import numpy as jnp
 import jsrm
 from jsrm.parameters.hsa_params import PARAMS_FPU_CONTROL, PARAMS_EPU_CONTROL
 from jsrm.systems import planar_hsa
+import numpy as onp
 import rclpy
 from rclpy.node import Node
 from rclpy.time import Time
@@ -131,6 +132,16 @@ class RandomSetpointsNode(Node):
             f"Finished jitting the forward kinematics and steady state simulation function."
         )
 
+        # bounds for sampling the actuation magnitude
+        self.phi_ss_mag_lb = 0.6 * jnp.ones_like(
+            self.params["phi_max"].flatten()
+        )  # lower bound for sampling [rad]
+        self.phi_ss_mag_ub = (
+            self.params["phi_max"].flatten() - 0.6
+        )  # upper bound for sampling [rad]
+        # handedness of the rods
+        self.h = self.params["h"].flatten()
+
         # initial setpoint index
         self.setpoint_idx = 0
 
@@ -144,20 +155,14 @@ class RandomSetpointsNode(Node):
         self.rng, rng_setpoint = random.split(self.rng)
 
         # sample the actuation magnitude
-        phi_ss_mag_lb = 0.6 * jnp.ones_like(
-            self.params["phi_max"].flatten()
-        )  # lower bound for sampling [rad]
-        phi_ss_mag_ub = (
-            self.params["phi_max"].flatten() - 0.6
-        )  # upper bound for sampling [rad]
         phi_ss_mag = random.uniform(
             rng_setpoint,
-            shape=phi_ss_mag_lb.shape,
-            minval=phi_ss_mag_lb,
-            maxval=phi_ss_mag_ub,
+            shape=self.phi_ss_mag_lb.shape,
+            minval=self.phi_ss_mag_lb,
+            maxval=self.phi_ss_mag_ub,
         )
         # compensate for the handedness of the rods
-        phi_ss = phi_ss_mag * self.params["h"].flatten()
+        phi_ss = phi_ss_mag * self.h
 
         rollout_start_time = self.get_clock().now()
         q_ss, q_d_ss = self.simulate_steady_state_fn(phi_ss)
@@ -171,15 +176,19 @@ class RandomSetpointsNode(Node):
         # Log the setpoint
         self.get_logger().info(f"chiee_ss: {chiee_ss}, q_ss: {q_ss}, phi_ss: {phi_ss}")
 
+        # transfer the setpoint to the host at once
+        chiee_ss_np = onp.asarray(chiee_ss)
+        q_ss_np = onp.asarray(q_ss)
+
         msg = PlanarSetpoint()
-        msg.chiee_des.x = chiee_ss[0].item()
-        msg.chiee_des.y = chiee_ss[1].item()
-        msg.chiee_des.theta = chiee_ss[2].item()
+        msg.chiee_des.x = float(chiee_ss_np[0])
+        msg.chiee_des.y = float(chiee_ss_np[1])
+        msg.chiee_des.theta = float(chiee_ss_np[2])
         msg.q_des.header.stamp = self.get_clock().now().to_msg()
-        msg.q_des.kappa_b = q_ss[0].item()
-        msg.q_des.sigma_sh = q_ss[1].item()
-        msg.q_des.sigma_a = q_ss[2].item()
-        msg.phi_ss = phi_ss.tolist()
+        msg.q_des.kappa_b = float(q_ss_np[0])
+        msg.q_des.sigma_sh = float(q_ss_np[1])
+        msg.q_des.sigma_a = float(q_ss_np[2])
+        msg.phi_ss = onp.asarray(phi_ss).tolist()
         self.pub.publish(msg)
 
         self.setpoint_idx += 1
@@ -2,20 +2,29 @@ from ament_index_python.packages import get_package_share_directory
 import derivative
 from example_interfaces.msg import Float64MultiArray
 from functools import partial
+import os
 from jax import config as jax_config
 
 jax_config.update("jax_enable_x64", True)  # double precision
 jax_config.update("jax_platform_name", "cpu")  # use CPU
-from jax import Array, jit
+# persistently cache the compiled executables to speed up subsequent launches of the node
+jax_config.update(
+    "jax_compilation_cache_dir",
+    os.path.join(os.path.expanduser("~"), ".cache", "hsa_planar_control"),
+)
+jax_config.update("jax_persistent_cache_min_compile_time_secs", 0.1)
+import jax
+from jax import Array, jit, lax
 from jax import numpy as jnp
 import jsrm
 from jsrm.parameters.hsa_params import PARAMS_FPU_CONTROL, PARAMS_EPU_CONTROL
 from jsrm.systems import planar_hsa
+import numpy as onp
 import rclpy
 from rclpy.node import Node
 from rclpy.time import Time
 from pathlib import Path
-import os
+from typing import Tuple
 
 from hsa_control_interfaces.msg import PlanarSetpoint
 from mocap_optitrack_interfaces.msg import PlanarCsConfiguration
@@ -118,12 +127,11 @@ class StaticPlanningNode(Node):
 
         if hsa_material == "fpu":
             # define residual function for static inversion optimization
-            self.residual_fn = jit(
-                static_inversion_factory(
-                    self.params,
-                    inverse_kinematics_end_effector_fn,
-                    dynamical_matrices_fn,
-                )
+            # the residual function returned by the factory is already jitted
+            self.residual_fn = static_inversion_factory(
+                self.params,
+                inverse_kinematics_end_effector_fn,
+                dynamical_matrices_fn,
             )
 
             if setpoint_mode == "manual":
@@ -157,15 +165,16 @@ class StaticPlanningNode(Node):
                 )
             elif setpoint_mode == "image":
                 # use fast but slightly inaccurate projected descent for image setpoints
-                self.planning_fn = jit(
-                    partial(
-                        statically_invert_actuation_to_task_space_projected_descent,
-                        params=self.params,
-                        residual_fn=self.residual_fn,
-                        inverse_kinematics_end_effector_fn=inverse_kinematics_end_effector_fn,
-                        maxiter=250,
-                        verbose=False,
-                    )
+                # the descent stops early once the optimality error is below the tolerance
+                self.declare_parameter("projected_descent_tol", 1e-5)
+                self.planning_fn = partial(
+                    statically_invert_actuation_to_task_space_projected_descent,
+                    params=self.params,
+                    residual_fn=self.residual_fn,
+                    inverse_kinematics_end_effector_fn=inverse_kinematics_end_effector_fn,
+                    maxiter=250,
+                    tol=self.get_parameter("projected_descent_tol").value,
+                    verbose=False,
                 )
 
                 self.declare_parameter("image_type", "star")
@@ -273,17 +282,50 @@ class StaticPlanningNode(Node):
         else:
             raise ValueError(f"Unknown HSA material: {hsa_material}")
 
-        # run the planning function once to compile it
-        dummy_planning_kwargs = {}
+        # setpoints with a larger optimality error are skipped
+        self.max_optimality_error = 1e-3
+
         if self.is_continuous_trajectory:
-            dummy_planning_kwargs["q0"] = self.q0
-            dummy_planning_kwargs["phi0"] = self.phi0
-        (
-            chiee_des_dummy,
-            q_des_dummy,
-            phi_ss_dummy,
-            optimality_error_dummy,
-        ) = self.planning_fn(pee_des=jnp.array([0.0, 0.110]), **dummy_planning_kwargs)
+
+            def plan_trajectory_fn(
+                pee_des_sps: Array, q0: Array, phi0: Array
+            ) -> Tuple[Array, Array, Array, Array]:
+                """
+                Sequentially plan all setpoints of the trajectory.
+                Each setpoint is warm-started with the last setpoint that was not skipped.
+                """
+
+                def plan_setpoint_fn(carry: Tuple[Array, Array], pee_des: Array):
+                    _q0, _phi0 = carry
+                    _plan = self.planning_fn(pee_des=pee_des, q0=_q0, phi0=_phi0)
+                    _, _q_des, _phi_ss, _optimality_error = _plan
+                    is_accepted = _optimality_error <= self.max_optimality_error
+                    carry = (
+                        jnp.where(is_accepted, _q_des, _q0),
+                        jnp.where(is_accepted, _phi_ss, _phi0),
+                    )
+                    return carry, _plan
+
+                _, plans = lax.scan(plan_setpoint_fn, (q0, phi0), pee_des_sps)
+                return plans
+
+            # plan the entire trajectory ahead of time so that the timer only needs to look up the setpoints
+            planning_start_time = self.get_clock().now()
+            self.plans = jax.device_get(
+                jit(plan_trajectory_fn)(self.pee_des_sps, self.q0, self.phi0)
+            )
+            self.get_logger().info(
+                f"Planned all {self.pee_des_sps.shape[0]} setpoints of the trajectory. "
+                f"Planning (including compilation) took: {(self.get_clock().now() - planning_start_time).nanoseconds / 1e6} ms"
+            )
+        else:
+            # run the planning function once to compile it
+            (
+                chiee_des_dummy,
+                q_des_dummy,
+                phi_ss_dummy,
+                optimality_error_dummy,
+            ) = self.planning_fn(pee_des=jnp.array([0.0, 0.110]))
         self.get_logger().info("Done compiling planning function!")
 
         # initial setpoint index
@@ -295,48 +337,51 @@ class StaticPlanningNode(Node):
         )
 
     def timer_callback(self):
-        planning_start_time = self.get_clock().now()
-
-        planning_kwargs = {}
         if self.is_continuous_trajectory:
-            planning_kwargs.update({"q0": self.q0, "phi0": self.phi0})
-        chiee_des, q_des, phi_ss, optimality_error = self.planning_fn(
-            pee_des=self.pee_des_sps[self.setpoint_idx], **planning_kwargs
-        )
+            # look up the precomputed plan. Beyond the end of the trajectory, we hold the last setpoint
+            idx = min(self.setpoint_idx, self.pee_des_sps.shape[0] - 1)
+            chiee_des, q_des, phi_ss, optimality_error = (
+                plan[idx] for plan in self.plans
+            )
+        else:
+            planning_start_time = self.get_clock().now()
+            chiee_des, q_des, phi_ss, optimality_error = self.planning_fn(
+                pee_des=self.pee_des_sps[self.setpoint_idx]
+            )
 
-        # Log how long the planning took
-        self.get_logger().info(
-            f"Planning took: {(self.get_clock().now() - planning_start_time).nanoseconds / 1e6} ms"
-        )
+            # Log how long the planning took
+            self.get_logger().info(
+                f"Planning took: {(self.get_clock().now() - planning_start_time).nanoseconds / 1e6} ms"
+            )
 
         # Log the setpoint
         self.get_logger().info(
             f"chiee_des: {chiee_des}, q_des: {q_des}, phi_ss: {phi_ss}, optimality_error: {optimality_error}"
         )
 
+        # transfer the plan to the host at once
+        chiee_des_np = onp.asarray(chiee_des)
+        q_des_np = onp.asarray(q_des)
+        optimality_error = float(optimality_error)
+
         # skip setpoint if optimality error is too large
-        if optimality_error > 1e-3:
+        if optimality_error > self.max_optimality_error:
             self.get_logger().warn("Skipping setpoint due to large optimality error.")
             self.setpoint_idx += 1
             return
 
         msg = PlanarSetpoint()
-        msg.chiee_des.x = chiee_des[0].item()
-        msg.chiee_des.y = chiee_des[1].item()
-        msg.chiee_des.theta = chiee_des[2].item()
+        msg.chiee_des.x = float(chiee_des_np[0])
+        msg.chiee_des.y = float(chiee_des_np[1])
+        msg.chiee_des.theta = float(chiee_des_np[2])
         msg.q_des.header.stamp = self.get_clock().now().to_msg()
-        msg.q_des.kappa_b = q_des[0].item()
-        msg.q_des.sigma_sh = q_des[1].item()
-        msg.q_des.sigma_a = q_des[2].item()
-        msg.phi_ss = phi_ss.tolist()
-        msg.optimality_error = optimality_error.item()
+        msg.q_des.kappa_b = float(q_des_np[0])
+        msg.q_des.sigma_sh = float(q_des_np[1])
+        msg.q_des.sigma_a = float(q_des_np[2])
+        msg.phi_ss = onp.asarray(phi_ss).tolist()
+        msg.optimality_error = optimality_error
         self.pub.publish(msg)
 
-        # if it is a continuous trajectory, update the initial conditions
-        if self.is_continuous_trajectory:
-            self.q0 = q_des
-            self.phi0 = phi_ss
-
         self.setpoint_idx += 1
 
 
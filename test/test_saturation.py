@@ -0,0 +1,71 @@
+from jax import config as jax_config
+
+jax_config.update("jax_enable_x64", True)  # double precision
+import jax.numpy as jnp
+import pytest
+from jsrm.parameters.hsa_params import PARAMS_FPU_CONTROL
+
+from hsa_planar_control.controllers.saturation import saturate_control_inputs
+
+
+def test_saturate_control_inputs():
+    params = PARAMS_FPU_CONTROL.copy()
+    h = params["h"].flatten()
+    phi_max = params["phi_max"].flatten()
+
+    # the first control input exceeds the upper bound and the second one the lower bound
+    phi_des = h * jnp.array([2 * phi_max[0], -1.0])
+    phi_sat_target = jnp.array([phi_max[0], 0.0])
+    controller_state = {"integral_error": jnp.array([0.1, 0.2])}
+
+    # positional arguments without controller state
+    phi_sat, controller_info = saturate_control_inputs(params, phi_des, {})
+    assert jnp.allclose(phi_sat, phi_sat_target)
+    assert jnp.allclose(controller_info["phi_des_unsat"], phi_des)
+    assert jnp.allclose(controller_info["phi_des_sat"], phi_sat_target)
+
+    # positional arguments with controller state
+    phi_sat, controller_state_out, controller_info = saturate_control_inputs(
+        params, phi_des, controller_state, {}
+    )
+    assert jnp.allclose(phi_sat, phi_sat_target)
+    assert jnp.allclose(
+        controller_state_out["integral_error"], controller_state["integral_error"]
+    )
+    assert jnp.allclose(controller_info["phi_des_sat"], phi_sat_target)
+
+    # keyword arguments as used by the model-based control node
+    phi_sat, controller_state_out, controller_info = saturate_control_inputs(
+        params,
+        phi_des,
+        controller_state=controller_state,
+        controller_info={},
+    )
+    assert jnp.allclose(phi_sat, phi_sat_target)
+    assert jnp.allclose(
+        controller_state_out["integral_error"], controller_state["integral_error"]
+    )
+    assert jnp.allclose(controller_info["phi_des_unsat"], phi_des)
+    assert jnp.allclose(controller_info["phi_des_sat"], phi_sat_target)
+
+
+def test_saturate_control_inputs_invalid_arguments():
+    params = PARAMS_FPU_CONTROL.copy()
+    phi_des = jnp.zeros((2,))
+    controller_state = {"integral_error": jnp.zeros((2,))}
+
+    # the controller info is missing
+    with pytest.raises(ValueError):
+        saturate_control_inputs(params, phi_des)
+    with pytest.raises(ValueError):
+        saturate_control_inputs(params, phi_des, controller_state=controller_state)
+
+    # too many positional arguments
+    with pytest.raises(ValueError):
+        saturate_control_inputs(params, phi_des, controller_state, {}, {})
+
+
+if __name__ == "__main__":
+    test_saturate_control_inputs()
+    test_saturate_control_inputs_invalid_arguments()
+    print("All tests passed!")
@@ -0,0 +1,145 @@
+import jax
+from jax import config as jax_config
+
+jax_config.update("jax_enable_x64", True)  # double precision
+from jax import jit, random
+import jax.numpy as jnp
+import jsrm
+from jsrm.parameters.hsa_params import PARAMS_FPU_CONTROL
+from jsrm.systems import planar_hsa
+import numpy as onp
+from pathlib import Path
+
+from hsa_planar_control.collocated_form import mapping_into_collocated_form_factory
+from hsa_planar_control.controllers.control_step import (
+    COLLOCATED_FORM_CONTROLLER_TYPES,
+    SINGLE_PRECISION_CONTROLLER_TYPES,
+    control_step_factory,
+)
+
+# filepath to symbolic expressions
+sym_exp_filepath = (
+    Path(jsrm.__file__).parent / "symbolic_expressions" / "planar_hsa_ns-1_nrs-2.dill"
+)
+# maximum deviation of the control inputs [rad], which is well below the resolution of the motors
+ATOL = 1e-4
+
+(
+    _,
+    forward_kinematics_end_effector_fn,
+    jacobian_end_effector_fn,
+    _,
+    _,
+    _,
+) = planar_hsa.factory(sym_exp_filepath)
+
+
+def sample_control_inputs(num_samples: int = 3, seed: int = 0):
+    """
+    Sample configurations close to the straight configuration (i.e., kappa_b = 0) and in the entire workspace.
+    """
+    rng = random.PRNGKey(seed)
+    kappa_b_max = jnp.pi / jnp.mean(PARAMS_FPU_CONTROL["l"])
+    rng, subrng = random.split(rng)
+    kappa_b_ps = jnp.concatenate(
+        [
+            jnp.array([0.0, 1e-6, -1e-4, 1e-2]),
+            random.uniform(
+                subrng, (num_samples,), minval=-kappa_b_max, maxval=kappa_b_max
+            ),
+        ]
+    )
+
+    samples = []
+    for kappa_b in kappa_b_ps:
+        rng, subrng1, subrng2, subrng3, subrng4 = random.split(rng, 5)
+        sigma_sh = random.uniform(subrng1, (), minval=-0.05, maxval=0.05)
+        sigma_a = random.uniform(subrng2, (), minval=0.0, maxval=0.3)
+        q = jnp.stack([kappa_b, sigma_sh, sigma_a])
+        q_d = 0.1 * random.normal(subrng3, (3,))
+        q_des = jnp.array([kappa_b + 0.5, 0.0, 0.1])
+        # the end-effector pose is measured by the motion capture system
+        chiee = forward_kinematics_end_effector_fn(PARAMS_FPU_CONTROL, q)
+        chiee_d = jacobian_end_effector_fn(PARAMS_FPU_CONTROL, q) @ q_d
+        pee_des = forward_kinematics_end_effector_fn(PARAMS_FPU_CONTROL, q_des)[:2]
+        phi = random.uniform(subrng4, (2,), minval=0.0, maxval=3.0)
+        samples.append(
+            (
+                0.0,
+                chiee,
+                chiee_d,
+                q,
+                q_d,
+                phi,
+                {"integral_error": jnp.array([1e-2, -2e-2])},
+                pee_des,
+                q_des,
+                jnp.ones((2,)),
+            )
+        )
+    return samples
+
+
+def evaluate_controller(controller_type: str, dtype: onp.dtype, samples) -> onp.ndarray:
+    """
+    Evaluate the control step in the given precision in the same way as the model-based control node.
+    The system is created within the enabled precision, as the constants of its symbolic expressions are not cast.
+    """
+    _, _, _, _, dynamical_matrices_fn, sys_helpers = planar_hsa.factory(
+        sym_exp_filepath
+    )
+    if controller_type in COLLOCATED_FORM_CONTROLLER_TYPES:
+        map_into_collocated_form_fn, _ = mapping_into_collocated_form_factory(
+            sym_exp_filepath, sys_helpers
+        )
+    else:
+        map_into_collocated_form_fn = None
+    params = jax.tree_util.tree_map(
+        lambda x: x.astype(dtype) if hasattr(x, "astype") else x,
+        PARAMS_FPU_CONTROL.copy(),
+    )
+    control_step_fn = jit(
+        control_step_factory(
+            controller_type,
+            params,
+            dynamical_matrices_fn,
+            dt=1 / 40,
+            Kp=jnp.eye(2, dtype=dtype),
+            Ki=1e-1 * jnp.eye(2, dtype=dtype),
+            Kd=1e-2 * jnp.eye(2, dtype=dtype),
+            gamma=jnp.ones((2,), dtype=dtype),
+            map_into_collocated_form_fn=map_into_collocated_form_fn,
+            operational_space_dynamical_matrices_fn=sys_helpers[
+                "operational_space_dynamical_matrices_fn"
+            ],
+        )
+    )
+
+    phi_des_ps = []
+    for sample in samples:
+        sample = jax.tree_util.tree_map(lambda x: onp.asarray(x, dtype=dtype), sample)
+        phi_sat, _, controller_info = control_step_fn(*sample)
+        assert phi_sat.dtype == dtype
+        # compare the control inputs before the saturation, as the saturation would hide deviations
+        phi_des_ps.append(onp.asarray(controller_info["phi_des_unsat"]))
+    return onp.stack(phi_des_ps)
+
+
+def test_single_precision_control():
+    samples = sample_control_inputs()
+
+    for controller_type in SINGLE_PRECISION_CONTROLLER_TYPES:
+        phi_des_fp64 = evaluate_controller(controller_type, onp.float64, samples)
+        with jax.enable_x64(False):
+            phi_des_fp32 = evaluate_controller(controller_type, onp.float32, samples)
+
+        errors = onp.abs(phi_des_fp32 - phi_des_fp64).max(axis=-1)
+        for sample, error in zip(samples, errors):
+            assert (
+                error < ATOL
+            ), f"{controller_type} is not accurate in single precision for configuration q: {sample[3]}."
+
+
+if __name__ == "__main__":
+    test_single_precision_control()
+    print("All tests passed!")